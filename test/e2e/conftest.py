@@ -6,20 +6,29 @@ identity switching, MCP protocol compliance, GPG integration,
 and HSM (TPM/Secure Enclave) operations.
 
 Fixture Hierarchy:
-- Session-scoped: isolated_gpg_environment (reused across all tests)
-- Function-scoped: temp_git_repo, temp_config_dir (fresh per test)
+- Session-scoped: juggler_bin, juggler_help, juggler_version,
+  temp_config_dir, juggler_env, mcp_env, isolated_gpg_environment
+  (reused across all tests)
+- Module-scoped: mcp_server (one MCP server process per test module)
+- Function-scoped: temp_git_repo (fresh copy of a session template per test)
 - Conditional: swtpm_environment (only on Linux with swtpm available)
 """
 
+import configparser
 import json
 import os
+import selectors
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future
+from functools import cached_property
 from pathlib import Path
-from typing import Generator, Optional, Dict, Any
+from typing import Generator, Optional, Dict, Any, Union, Tuple
 
 import pytest
 
@@ -34,6 +43,9 @@ REMOTE_JUGGLER_BIN = os.environ.get(
     str(Path(__file__).parent.parent.parent / "target" / "release" / "remote_juggler"),
 )
 
+# Absolute binary path, resolved once on first use (see resolve_juggler_bin)
+_BIN_CACHE: Optional[str] = None
+
 # Path to pinentry-remotejuggler
 PINENTRY_BIN = os.environ.get(
     "PINENTRY_BIN",
@@ -51,56 +63,496 @@ TEST_GPG_KEY = {
 }
 
 
+# Identities shared by the switch and MCP tests (see temp_config_dir)
+TEST_CONFIG = {
+    "version": "2.0.0",
+    "identities": {
+        "personal": {
+            "provider": "gitlab",
+            "host": "gitlab-personal",
+            "hostname": "gitlab.com",
+            "user": "personaluser",
+            "email": "personal@example.com",
+            "identityFile": "~/.ssh/id_ed25519_personal",
+        },
+        "work": {
+            "provider": "gitlab",
+            "host": "gitlab-work",
+            "hostname": "gitlab.com",
+            "user": "workuser",
+            "email": "work@company.com",
+            "identityFile": "~/.ssh/id_ed25519_work",
+            "gpg": {
+                "keyId": "ABCD1234",
+                "signCommits": True,
+            },
+        },
+        "github": {
+            "provider": "github",
+            "host": "github.com",
+            "hostname": "github.com",
+            "user": "githubuser",
+            "email": "github@example.com",
+            "identityFile": "~/.ssh/id_ed25519_github",
+        },
+    },
+    "settings": {
+        "defaultProvider": "gitlab",
+        "autoDetect": True,
+        "useKeychain": False,
+        "gpgSign": True,
+    },
+}
+
+# Serialized once at import; temp_config_dir writes it verbatim
+TEST_CONFIG_JSON = json.dumps(TEST_CONFIG)
+
+# Host variables passed through to RemoteJuggler (see juggler_env / mcp_env)
+_ALLOWED_ENV = {"PATH", "HOME", "LANG", "USER", "TMPDIR"}
+_ALLOWED_ENV_PREFIXES = ("LC_", "CHPL_")
+
+# Minimal host environment, built once; tests never modify os.environ
+# for the binary, so every spawn can share it.
+_BASE_ENV = {
+    k: v
+    for k, v in os.environ.items()
+    if k in _ALLOWED_ENV or k.startswith(_ALLOWED_ENV_PREFIXES)
+}
+
+
 # =============================================================================
 # Utility Functions
 # =============================================================================
 
 
+def resolve_juggler_bin() -> str:
+    """Resolve REMOTE_JUGGLER_BIN to an absolute path, caching the result."""
+    global _BIN_CACHE
+    if _BIN_CACHE is None:
+        _BIN_CACHE = str(Path(REMOTE_JUGGLER_BIN).resolve(strict=False))
+    return _BIN_CACHE
+
+
+class JugglerResult:
+    """Outcome of a RemoteJuggler run with raw output bytes.
+
+    ``stdout``/``stderr`` decode lazily as UTF-8, so tests that only
+    check the return code never pay for decoding.
+    """
+
+    def __init__(
+        self,
+        args: list[str],
+        returncode: int,
+        stdout_bytes: bytes,
+        stderr_bytes: bytes,
+    ):
+        self.args = args
+        self.returncode = returncode
+        self.stdout_bytes = stdout_bytes
+        self.stderr_bytes = stderr_bytes
+
+    @cached_property
+    def stdout(self) -> str:
+        return self.stdout_bytes.decode("utf-8", errors="replace")
+
+    @cached_property
+    def stderr(self) -> str:
+        return self.stderr_bytes.decode("utf-8", errors="replace")
+
+
 def run_juggler(
     args: list[str],
     env: Optional[dict] = None,
     cwd: Optional[Path] = None,
-    input_data: Optional[str] = None,
-    timeout: int = 30,
-) -> subprocess.CompletedProcess:
-    """Run RemoteJuggler with given arguments."""
-    cmd = [REMOTE_JUGGLER_BIN] + args
+    input_data: Optional[Union[str, bytes]] = None,
+    timeout: int = 10,
+    capture_stderr: bool = True,
+) -> JugglerResult:
+    """Run RemoteJuggler with given arguments.
 
-    return subprocess.run(
+    The binary path is resolved once and cached (see resolve_juggler_bin).
+    With ``capture_stderr=False`` stderr goes to /dev/null and the
+    result's stderr is empty.
+    """
+    cmd = [resolve_juggler_bin(), *args]
+
+    if input_data is None:
+        returncode, stdout, stderr = _spawn_no_stdin(
+            cmd, env, cwd, timeout, capture_stderr
+        )
+        return JugglerResult(cmd, returncode, stdout, stderr)
+
+    result = subprocess.run(
+        cmd,
+        env=env,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+        input=input_data.encode() if isinstance(input_data, str) else input_data,
+        timeout=timeout,
+    )
+    return JugglerResult(
+        cmd, result.returncode, result.stdout, result.stderr or b""
+    )
+
+
+def _spawn_no_stdin(
+    cmd: list[str],
+    env: Optional[dict],
+    cwd: Optional[Path],
+    timeout: float,
+    capture_stderr: bool = True,
+) -> tuple[int, bytes, bytes]:
+    """Run ``cmd`` with no stdin, reading raw pipe fds until both close.
+
+    A leaner path than subprocess.run for the common no-input case: no
+    buffered file objects, just os.read into bytearrays.
+    """
+    proc = subprocess.Popen(
         cmd,
-        env=env or os.environ,
+        env=env,
         cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+        bufsize=0,
+    )
+    stdout_fd = proc.stdout.fileno()
+    stderr_fd = proc.stderr.fileno() if capture_stderr else None
+    buffers = {stdout_fd: bytearray()}
+    if stderr_fd is not None:
+        buffers[stderr_fd] = bytearray()
+
+    deadline = time.monotonic() + timeout
+    with proc, selectors.DefaultSelector() as sel:
+        for fd in buffers:
+            sel.register(fd, selectors.EVENT_READ)
+
+        try:
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+                for key, _ in sel.select(remaining):
+                    data = os.read(key.fd, 65536)
+                    if data:
+                        buffers[key.fd] += data
+                    else:
+                        sel.unregister(key.fd)
+
+            returncode = proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except BaseException:
+            # As subprocess.run does: kill before Popen.__exit__ waits, so
+            # a timeout, pytest-timeout or Ctrl-C never hangs on the child
+            proc.kill()
+            raise
+
+    stderr = bytes(buffers[stderr_fd]) if stderr_fd is not None else b""
+    return returncode, bytes(buffers[stdout_fd]), stderr
+
+
+def run_git(
+    args: list[str],
+    cwd: Path,
+    check: bool = False,
+) -> subprocess.CompletedProcess:
+    """Run git in ``cwd`` with text output captured."""
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=check,
         capture_output=True,
         text=True,
-        input=input_data,
-        timeout=timeout,
     )
 
 
+_GIT_ESCAPES = {"n": "\n", "t": "\t", "b": "\b", '"': '"', "\\": "\\"}
+
+
+def _git_unquote(raw: str) -> str:
+    """Decode a raw .git/config value the way ``git config`` prints it.
+
+    Mirrors git's parse_value: double quotes and backslash escapes are
+    removed, ``;``/``#`` outside quotes start a comment, and unquoted
+    whitespace is dropped at the ends.
+    """
+    out = ""
+    quoted = False
+    space = 0
+    i = 0
+    while i < len(raw):
+        c = raw[i]
+        i += 1
+        if not quoted and c in " \t":
+            if out:
+                space += 1
+            continue
+        if not quoted and c in ";#":
+            break
+        out += " " * space
+        space = 0
+        if c == "\\" and i < len(raw):
+            out += _GIT_ESCAPES.get(raw[i], raw[i])
+            i += 1
+        elif c == '"':
+            quoted = not quoted
+        else:
+            out += c
+    return out
+
+
+def git_cfg(repo: Path, section: str, key: str) -> Optional[str]:
+    """Read ``key`` from a repo's own .git/config without forking git.
+
+    Subsections use git's spelling, e.g. ``'remote "origin"'``. Section
+    and key names match case-insensitively (subsection names exactly),
+    and values are unquoted as git does. Returns None when the section
+    or key is missing.
+    """
+    cp = configparser.ConfigParser(strict=False, interpolation=None)
+    cp.read(repo / ".git" / "config")
+
+    # Like git, the last matching entry wins across differently-cased
+    # spellings of the same section
+    name, _, sub = section.partition(" ")
+    value = None
+    for candidate in cp.sections():
+        cand_name, _, cand_sub = candidate.partition(" ")
+        if cand_name.lower() == name.lower() and cand_sub == sub:
+            raw = cp.get(candidate, key, fallback=None)
+            if raw is not None:
+                value = _git_unquote(raw)
+    return value
+
+
+def contains_ci(result: JugglerResult, *needles: bytes) -> bool:
+    """Case-insensitive check for any of ``needles`` in stdout or stderr.
+
+    Scans the raw byte buffers, so no decode or stdout + stderr copy.
+    """
+    stdout = result.stdout_bytes.lower()
+    stderr = result.stderr_bytes.lower()
+    return any(n in stdout or n in stderr for n in needles)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _first_json(buf: str) -> dict:
+    """Return the first line of ``buf`` that is a JSON object, or {}.
+
+    Decodes in place with raw_decode instead of splitting into lines; a
+    value only counts if it is an object spanning the rest of its line,
+    so log lines like ``2024-10-14 MCP: ...`` are skipped.
+    """
+    i, n = 0, len(buf)
+    while i < n:
+        while i < n and buf[i] in " \t\r\n":
+            i += 1
+        if i >= n:
+            break
+        nl = buf.find("\n", i)
+        line_end = n if nl < 0 else nl
+        try:
+            obj, end = _JSON_DECODER.raw_decode(buf, i)
+        except json.JSONDecodeError:
+            obj, end = None, i
+        if isinstance(obj, dict) and not buf[end:line_end].strip():
+            return obj
+        if nl < 0:
+            break
+        i = nl + 1
+
+    return {}
+
+
+# A request is a dict, or a pre-serialized (id, bytes) pair whose id is
+# carried alongside so it never has to be parsed back out of the bytes
+MCPRequest = Union[dict, Tuple[Any, bytes]]
+
+
+def request_id(request: MCPRequest) -> Any:
+    """Return the JSON-RPC id of a request (None for notifications)."""
+    if isinstance(request, tuple):
+        return request[0]
+    return request.get("id")
+
+
+def preserialize(request: dict) -> Tuple[Any, bytes]:
+    """Serialize ``request`` once into an (id, bytes) pair.
+
+    The id is taken from the dict, so it is only ever written once.
+    """
+    return request.get("id"), json.dumps(request).encode()
+
+
+def encode_request(request: MCPRequest) -> bytes:
+    """Serialize a JSON-RPC request.
+
+    The bytes of an (id, bytes) pair from preserialize() are returned
+    as-is; plain bytes are not accepted, as their id would be unknown.
+    """
+    if isinstance(request, tuple):
+        return request[1]
+    return json.dumps(request).encode()
+
+
 def run_mcp_request(
-    request: dict,
+    request: MCPRequest,
     env: Optional[dict] = None,
     timeout: int = 10,
 ) -> dict:
     """Send a JSON-RPC request to RemoteJuggler MCP server."""
-    request_str = json.dumps(request) + "\n"
-
     result = run_juggler(
         ["--mode=mcp"],
         env=env,
-        input_data=request_str,
+        input_data=encode_request(request) + b"\n",
         timeout=timeout,
     )
 
-    # Parse the response (skip any debug output on stderr)
-    if result.stdout:
-        for line in result.stdout.strip().split("\n"):
-            try:
-                return json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    # Parse the response (skip any debug output on stdout)
+    return _first_json(result.stdout)
 
-    return {}
+
+# initialize handshake, pre-serialized as an (id, bytes) request
+MCP_INIT_REQUEST = preserialize({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "1.0"}
+    }
+})
+
+
+class MCPClient:
+    """
+    Pipelined JSON-RPC client for a long-lived MCP server process.
+
+    A background thread drains stdout and resolves one Future per
+    request id, so a batch is written in full before any response is
+    awaited and a chatty server can never block on a full stdout pipe.
+    """
+
+    def __init__(self, proc: subprocess.Popen):
+        self.proc = proc
+        self._lock = threading.Lock()
+        self._pending: Dict[Any, deque] = {}
+        self._closed = False
+        # Reply to the first initialize, set by the mcp_server fixture
+        self.init_response: dict = {}
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def request(self, request: MCPRequest, timeout: int = 10) -> dict:
+        """Send one request and return its JSON response (or {})."""
+        return self.batch([request], timeout=timeout)[0]
+
+    def batch(
+        self,
+        requests: list[MCPRequest],
+        timeout: int = 10,
+    ) -> list[dict]:
+        """Send several requests in one write; responses match by id.
+
+        Missing responses (server exited) and notifications are {}.
+        """
+        futures = self.submit(requests)
+        try:
+            return [f.result(timeout=timeout) for f in futures]
+        finally:
+            # A waiter left behind after a timeout would take the reply
+            # meant for the next request that reuses its id
+            self._forget(requests, futures)
+
+    def submit(self, requests: list[MCPRequest]) -> list[Future]:
+        """Write all requests at once and return a Future per request.
+
+        Notifications (no id) never get a reply, so their Futures are
+        resolved with {} immediately.
+        """
+        payloads = [encode_request(r) for r in requests]
+        futures = []
+
+        # Register before writing so a fast response always finds its Future
+        with self._lock:
+            for request in requests:
+                future: Future = Future()
+                req_id = request_id(request)
+                if self._closed or req_id is None:
+                    future.set_result({})
+                else:
+                    self._pending.setdefault(req_id, deque()).append(future)
+                futures.append(future)
+
+        try:
+            self.proc.stdin.write(b"".join(p + b"\n" for p in payloads))
+            self.proc.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            # Server gone or stdin already closed; the reader sees EOF
+            # and resolves the futures with {}
+            pass
+
+        return futures
+
+    def _forget(self, requests: list[MCPRequest], futures: list[Future]) -> None:
+        """Drop still-pending ``futures`` so no later reply lands on them."""
+        with self._lock:
+            for request, future in zip(requests, futures):
+                if future.done():
+                    continue
+                waiters = self._pending.get(request_id(request))
+                if waiters is None:
+                    continue
+                try:
+                    waiters.remove(future)
+                except ValueError:
+                    pass
+                if not waiters:
+                    del self._pending[request_id(request)]
+
+    def _read_loop(self) -> None:
+        try:
+            # Skip any non-JSON debug output, as run_mcp_request does;
+            # ValueError also covers UnicodeDecodeError on non-UTF-8 lines
+            for line in self.proc.stdout:
+                try:
+                    response = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(response, dict):
+                    continue
+
+                with self._lock:
+                    waiters = self._pending.get(response.get("id"))
+                    future = waiters.popleft() if waiters else None
+                if future is not None:
+                    future.set_result(response)
+                # Anything else (e.g. notifications) has no waiter; drop it
+        finally:
+            # Server exited (or the reader failed): nothing more will arrive
+            with self._lock:
+                self._closed = True
+                waiters = [f for q in self._pending.values() for f in q]
+                self._pending.clear()
+            for future in waiters:
+                future.set_result({})
+
+    def close(self) -> None:
+        """Close stdin so the server sees EOF, then reap it."""
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self._reader.join(timeout=2)
 
 
 def wait_for_process(proc: subprocess.Popen, timeout: int = 5) -> bool:
@@ -113,49 +565,72 @@ def wait_for_process(proc: subprocess.Popen, timeout: int = 5) -> bool:
     return True
 
 
+# =============================================================================
+# Binary Fixtures
+# =============================================================================
+
+
+@pytest.fixture(scope="session")
+def juggler_bin() -> str:
+    """Absolute path to the RemoteJuggler binary, resolved once per session."""
+    return resolve_juggler_bin()
+
+
+@pytest.fixture(scope="session")
+def juggler_help(juggler_env: dict) -> JugglerResult:
+    """Output of ``remote_juggler --help``; deterministic, run once."""
+    return run_juggler(["--help"], env=juggler_env, capture_stderr=False)
+
+
+@pytest.fixture(scope="session")
+def juggler_version(juggler_env: dict) -> JugglerResult:
+    """Output of ``remote_juggler --version``; deterministic, run once."""
+    return run_juggler(["--version"], env=juggler_env, capture_stderr=False)
+
+
 # =============================================================================
 # Git Repository Fixtures
 # =============================================================================
 
 
-@pytest.fixture
-def temp_git_repo() -> Generator[Path, None, None]:
-    """Create a temporary git repository for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        repo_path = Path(tmpdir) / "test-repo"
-        repo_path.mkdir()
+@pytest.fixture(scope="session")
+def _git_repo_template(tmp_path_factory) -> Path:
+    """Session-wide template repository copied by temp_git_repo."""
+    repo_path = tmp_path_factory.mktemp("git-template") / "test-repo"
+    repo_path.mkdir()
 
-        # Initialize git repo
-        subprocess.run(
-            ["git", "init"],
-            cwd=repo_path,
-            check=True,
-            capture_output=True,
-        )
+    # Initialize git repo
+    subprocess.run(
+        ["git", "init", "-q", "-b", "main"],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+    )
 
-        # Configure minimal git settings
-        subprocess.run(
-            ["git", "config", "user.name", "Test User"],
-            cwd=repo_path,
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.email", "test@example.com"],
-            cwd=repo_path,
-            check=True,
-            capture_output=True,
+    # Minimal git settings plus a placeholder remote, appended to the
+    # config git init wrote instead of forking `git config`/`git remote`
+    with open(repo_path / ".git" / "config", "a") as f:
+        f.write(
+            "[user]\n"
+            "\tname = Test User\n"
+            "\temail = test@example.com\n"
+            '[remote "origin"]\n'
+            "\turl = git@gitlab-personal:test/repo.git\n"
+            "\tfetch = +refs/heads/*:refs/remotes/origin/*\n"
         )
 
-        # Add a remote (using a placeholder)
-        subprocess.run(
-            ["git", "remote", "add", "origin", "git@gitlab-personal:test/repo.git"],
-            cwd=repo_path,
-            check=True,
-            capture_output=True,
-        )
+    return repo_path
 
-        yield repo_path
+
+@pytest.fixture
+def temp_git_repo(tmp_path: Path, _git_repo_template: Path) -> Path:
+    """Create a temporary git repository for testing.
+
+    Copies the session template instead of re-running git init/config.
+    """
+    repo_path = tmp_path / "test-repo"
+    shutil.copytree(_git_repo_template, repo_path)
+    return repo_path
 
 
 # =============================================================================
@@ -163,58 +638,23 @@ def temp_git_repo() -> Generator[Path, None, None]:
 # =============================================================================
 
 
-@pytest.fixture
-def temp_config_dir() -> Generator[Path, None, None]:
-    """Create a temporary config directory with test identities."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        config_dir = Path(tmpdir) / ".config" / "remote-juggler"
-        config_dir.mkdir(parents=True)
-
-        # Create test config
-        config = {
-            "version": "2.0.0",
-            "identities": {
-                "personal": {
-                    "provider": "gitlab",
-                    "host": "gitlab-personal",
-                    "hostname": "gitlab.com",
-                    "user": "personaluser",
-                    "email": "personal@example.com",
-                    "identityFile": "~/.ssh/id_ed25519_personal",
-                },
-                "work": {
-                    "provider": "gitlab",
-                    "host": "gitlab-work",
-                    "hostname": "gitlab.com",
-                    "user": "workuser",
-                    "email": "work@company.com",
-                    "identityFile": "~/.ssh/id_ed25519_work",
-                    "gpg": {
-                        "keyId": "ABCD1234",
-                        "signCommits": True,
-                    },
-                },
-                "github": {
-                    "provider": "github",
-                    "host": "github.com",
-                    "hostname": "github.com",
-                    "user": "githubuser",
-                    "email": "github@example.com",
-                    "identityFile": "~/.ssh/id_ed25519_github",
-                },
-            },
-            "settings": {
-                "defaultProvider": "gitlab",
-                "autoDetect": True,
-                "useKeychain": False,
-                "gpgSign": True,
-            },
-        }
+@pytest.fixture(scope="session")
+def temp_config_dir(request) -> Path:
+    """Create a temporary config directory with test identities.
+
+    Session-scoped: no test writes to the config, so one directory is
+    shared by every switch and MCP test.
+    """
+    tmpdir = tempfile.mkdtemp()
+    request.addfinalizer(lambda: shutil.rmtree(tmpdir, ignore_errors=True))
 
-        config_file = config_dir / "config.json"
-        config_file.write_text(json.dumps(config, indent=2))
+    config_dir = Path(tmpdir) / ".config" / "remote-juggler"
+    config_dir.mkdir(parents=True)
+
+    config_file = config_dir / "config.json"
+    config_file.write_text(TEST_CONFIG_JSON)
 
-        yield config_dir
+    return config_dir
 
 
 @pytest.fixture
@@ -223,21 +663,50 @@ def temp_dir(tmp_path: Path) -> Path:
     return tmp_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def juggler_env(temp_config_dir: Path) -> dict:
     """Create environment with custom config path."""
-    env = os.environ.copy()
-    env["HOME"] = str(temp_config_dir.parent.parent)
-    env["REMOTE_JUGGLER_CONFIG"] = str(temp_config_dir / "config.json")
-    return env
+    return {
+        **_BASE_ENV,
+        "HOME": str(temp_config_dir.parent.parent),
+        "REMOTE_JUGGLER_CONFIG": str(temp_config_dir / "config.json"),
+    }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mcp_env(temp_config_dir: Path) -> dict:
     """Environment for MCP server testing."""
-    env = os.environ.copy()
-    env["HOME"] = str(temp_config_dir.parent.parent)
-    return env
+    return {
+        **_BASE_ENV,
+        "HOME": str(temp_config_dir.parent.parent),
+    }
+
+
+@pytest.fixture(scope="module")
+def mcp_server(mcp_env: dict, juggler_bin: str) -> Generator[MCPClient, None, None]:
+    """
+    Module-wide MCP server process speaking JSON-RPC over stdin/stdout.
+
+    The initialize handshake is done once before the client is yielded,
+    so every test sees a Ready server regardless of test order; its reply
+    is kept as ``client.init_response``. Paths that need an uninitialized
+    server must use a one-shot process (run_mcp_request) instead.
+    """
+    proc = subprocess.Popen(
+        [juggler_bin, "--mode=mcp"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        # Server logging on stderr is never read; a PIPE would eventually
+        # fill up and block the server mid-session.
+        stderr=subprocess.DEVNULL,
+        env=mcp_env,
+    )
+    client = MCPClient(proc)
+    try:
+        client.init_response = client.request(MCP_INIT_REQUEST)
+        yield client
+    finally:
+        client.close()
 
 
 # =============================================================================
@@ -629,6 +1098,21 @@ def pytest_configure(config):
         "markers", "multi_identity: tests for concurrent identity switches"
     )
     config.addinivalue_line("markers", "installation: tests for installed binary")
+    config.addinivalue_line(
+        "markers", "binary: tests that run the built RemoteJuggler binary"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip binary-marked tests up front when the binary is missing."""
+    juggler_bin = resolve_juggler_bin()
+    if Path(juggler_bin).is_file():
+        return
+
+    skip = pytest.mark.skip(reason=f"binary missing: {juggler_bin}")
+    for item in items:
+        if item.get_closest_marker("binary"):
+            item.add_marker(skip)
 
 
 # =============================================================================
@@ -919,7 +1403,7 @@ def cli_binary() -> Path:
         return Path(installed)
 
     # Fall back to build artifact
-    build_path = Path(REMOTE_JUGGLER_BIN)
+    build_path = Path(resolve_juggler_bin())
     if build_path.exists():
         return build_path
 
@@ -14,7 +14,21 @@ from typing import Optional
 
 import pytest
 
-from conftest import run_juggler, run_mcp_request
+from conftest import (
+    MCPClient, preserialize, request_id, run_juggler, run_mcp_request,
+)
+
+
+pytestmark = pytest.mark.binary
+
+
+# Fixed request skeleton, serialized once and written to stdin as-is
+_TOOLS_LIST_REQ = preserialize({
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/list",
+    "params": {}
+})
 
 
 class TestMCPProtocol:
@@ -35,23 +49,9 @@ class TestMCPProtocol:
 class TestMCPInitialize:
     """Tests for MCP initialization handshake."""
 
-    def test_initialize_request(self, mcp_env: dict):
+    def test_initialize_request(self, mcp_server: MCPClient):
         """Test MCP initialize request returns proper response."""
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {
-                    "name": "test-client",
-                    "version": "1.0.0"
-                }
-            }
-        }
-
-        response = run_mcp_request(request, env=mcp_env)
+        response = mcp_server.init_response
 
         # Should return a valid JSON-RPC response
         if response:
@@ -60,23 +60,9 @@ class TestMCPInitialize:
             assert "result" in response or "error" in response, \
                 f"Response missing result/error: {response}"
 
-    def test_initialize_returns_server_info(self, mcp_env: dict):
+    def test_initialize_returns_server_info(self, mcp_server: MCPClient):
         """Test initialize returns server capabilities."""
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {
-                    "name": "test-client",
-                    "version": "1.0.0"
-                }
-            }
-        }
-
-        response = run_mcp_request(request, env=mcp_env)
+        response = mcp_server.init_response
 
         if response and "result" in response:
             result = response["result"]
@@ -88,30 +74,9 @@ class TestMCPInitialize:
 class TestMCPToolsList:
     """Tests for MCP tools/list endpoint."""
 
-    def test_tools_list_returns_tools(self, mcp_env: dict):
+    def test_tools_list_returns_tools(self, mcp_server: MCPClient):
         """Test tools/list returns available tools."""
-        # First initialize
-        init_request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {"name": "test", "version": "1.0"}
-            }
-        }
-        run_mcp_request(init_request, env=mcp_env)
-
-        # Then list tools
-        request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "tools/list",
-            "params": {}
-        }
-
-        response = run_mcp_request(request, env=mcp_env)
+        response = mcp_server.request(_TOOLS_LIST_REQ)
 
         if response and "result" in response:
             result = response["result"]
@@ -120,16 +85,9 @@ class TestMCPToolsList:
                 assert isinstance(result["tools"], list), \
                     f"Tools should be a list: {result}"
 
-    def test_tools_list_includes_juggler_tools(self, mcp_env: dict):
+    def test_tools_list_includes_juggler_tools(self, mcp_server: MCPClient):
         """Test tools/list includes RemoteJuggler-specific tools."""
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/list",
-            "params": {}
-        }
-
-        response = run_mcp_request(request, env=mcp_env)
+        response = mcp_server.request(_TOOLS_LIST_REQ)
 
         if response and "result" in response:
             result = response["result"]
@@ -151,47 +109,67 @@ class TestMCPToolsList:
                 f"No juggler tools found in: {tool_names}"
 
 
-class TestMCPToolsCall:
-    """Tests for MCP tools/call endpoint."""
+@pytest.fixture(scope="class")
+def tool_responses(mcp_server: MCPClient) -> dict:
+    """TestMCPToolsCall requests for stateless tools, as one batch.
 
-    def test_call_list_identities(self, mcp_env: dict):
-        """Test calling juggler_list_identities tool."""
-        request = {
+    Returns the responses keyed by each request's id.
+    """
+    requests = [
+        {
             "jsonrpc": "2.0",
-            "id": 1,
+            "id": 2,
             "method": "tools/call",
             "params": {
                 "name": "juggler_list_identities",
                 "arguments": {}
             }
-        }
+        },
+        {
+            "jsonrpc": "2.0",
+            "id": 3,
+            "method": "tools/call",
+            "params": {
+                "name": "juggler_status",
+                "arguments": {}
+            }
+        },
+        {
+            "jsonrpc": "2.0",
+            "id": 4,
+            "method": "tools/call",
+            "params": {
+                "name": "nonexistent_tool_xyz",
+                "arguments": {}
+            }
+        },
+    ]
+
+    responses = mcp_server.batch(requests)
+    return {request_id(r): resp for r, resp in zip(requests, responses)}
 
-        response = run_mcp_request(request, env=mcp_env)
+
+class TestMCPToolsCall:
+    """Tests for MCP tools/call endpoint."""
+
+    def test_call_list_identities(self, tool_responses: dict):
+        """Test calling juggler_list_identities tool."""
+        response = tool_responses[2]
 
         if response:
             # Should return result or error, not crash
             assert "result" in response or "error" in response, \
                 f"Invalid response: {response}"
 
-    def test_call_status(self, mcp_env: dict):
+    def test_call_status(self, tool_responses: dict):
         """Test calling juggler_status tool."""
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {
-                "name": "juggler_status",
-                "arguments": {}
-            }
-        }
-
-        response = run_mcp_request(request, env=mcp_env)
+        response = tool_responses[3]
 
         if response:
             assert "result" in response or "error" in response, \
                 f"Invalid response: {response}"
 
-    def test_call_switch_with_identity(self, mcp_env: dict, temp_git_repo: Path):
+    def test_call_switch_with_identity(self, mcp_server: MCPClient, temp_git_repo: Path):
         """Test calling juggler_switch with identity parameter."""
         request = {
             "jsonrpc": "2.0",
@@ -206,20 +184,45 @@ class TestMCPToolsCall:
             }
         }
 
-        response = run_mcp_request(request, env=mcp_env)
+        response = mcp_server.request(request)
 
         if response:
             assert "result" in response or "error" in response, \
                 f"Invalid response: {response}"
 
-    def test_call_unknown_tool(self, mcp_env: dict):
+    def test_call_unknown_tool(self, tool_responses: dict):
         """Test calling unknown tool returns error."""
+        response = tool_responses[4]
+
+        if response:
+            # Should return error for unknown tool
+            assert "error" in response or \
+                   ("result" in response and "unknown" in str(response["result"]).lower()), \
+                   f"Should error for unknown tool: {response}"
+
+
+class TestMCPUninitialized:
+    """Tests for requests sent before the initialize handshake.
+
+    These need a fresh server, so each runs its own one-shot process.
+    """
+
+    def test_tools_list_before_initialize(self, mcp_env: dict):
+        """Test tools/list is allowed before initialize."""
+        response = run_mcp_request(_TOOLS_LIST_REQ, env=mcp_env)
+
+        if response:
+            assert "result" in response, \
+                f"tools/list should work before initialize: {response}"
+
+    def test_tools_call_before_initialize(self, mcp_env: dict):
+        """Test tools/call is rejected before initialize."""
         request = {
             "jsonrpc": "2.0",
             "id": 1,
             "method": "tools/call",
             "params": {
-                "name": "nonexistent_tool_xyz",
+                "name": "juggler_status",
                 "arguments": {}
             }
         }
@@ -227,53 +230,98 @@ class TestMCPToolsCall:
         response = run_mcp_request(request, env=mcp_env)
 
         if response:
-            # Should return error for unknown tool
-            assert "error" in response or \
-                   ("result" in response and "unknown" in str(response["result"]).lower()), \
-                   f"Should error for unknown tool: {response}"
+            assert "error" in response, \
+                f"tools/call should be rejected before initialize: {response}"
+
+
+@pytest.fixture(scope="module")
+def error_probes(mcp_env: dict) -> tuple:
+    """
+    Feed all TestMCPErrorHandling probes to one MCP server process.
+
+    Sends invalid JSON, a request without a method and an unknown method
+    on one stdin stream, then reads the output after EOF.
+
+    Each request probe has its own id and replies are looked up by id.
+    Errors the server cannot tie to a request (parse errors, and on this
+    server also the missing-method request) come back with id 0 or null;
+    those go to the probes without an id-matched reply, in send order.
+
+    Returns:
+        (stdout, stderr, responses) where responses maps probe name to its
+        response; {} for a probe that got no response.
+    """
+    probes = {
+        "invalid_json": (None, "not valid json"),
+        "missing_method": (2, json.dumps({
+            "jsonrpc": "2.0",
+            "id": 2,
+            "params": {}
+            # Missing "method" field
+        })),
+        "unknown_method": (3, json.dumps({
+            "jsonrpc": "2.0",
+            "id": 3,
+            "method": "unknown/method",
+            "params": {}
+        })),
+    }
+
+    result = run_juggler(
+        ["--mode=mcp"],
+        env=mcp_env,
+        input_data="".join(payload + "\n" for _, payload in probes.values())
+    )
+
+    by_id = {}
+    unmatched = []
+    for line in result.stdout_bytes.splitlines():
+        try:
+            response = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(response, dict):
+            continue
+        if response.get("id") in (0, None):
+            unmatched.append(response)
+        else:
+            by_id.setdefault(response["id"], response)
+
+    responses = {}
+    for name, (probe_id, _) in probes.items():
+        response = by_id.get(probe_id)
+        if response is None:
+            response = unmatched.pop(0) if unmatched else {}
+        responses[name] = response
+
+    return result.stdout, result.stderr, responses
 
 
 class TestMCPErrorHandling:
     """Tests for MCP error handling."""
 
-    def test_invalid_json_handled(self, mcp_env: dict):
+    def test_invalid_json_handled(self, error_probes: tuple):
         """Test server handles invalid JSON gracefully."""
-        result = run_juggler(
-            ["--mode=mcp"],
-            env=mcp_env,
-            input_data="not valid json\n"
-        )
+        _, stderr, _ = error_probes
 
         # Should not crash (exit code 0 or graceful error)
-        assert "panic" not in result.stderr.lower(), \
-            f"Server panicked: {result.stderr}"
+        assert "panic" not in stderr.lower(), \
+            f"Server panicked: {stderr}"
 
-    def test_missing_method_handled(self, mcp_env: dict):
+    def test_missing_method_handled(self, error_probes: tuple):
         """Test server handles missing method field."""
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "params": {}
-            # Missing "method" field
-        }
-
-        response = run_mcp_request(request, env=mcp_env)
+        _, _, responses = error_probes
+        response = responses["missing_method"]
 
         if response:
             # Should return error for invalid request
             assert "error" in response or response == {}, \
                 f"Should error for missing method: {response}"
 
-    def test_unknown_method_returns_error(self, mcp_env: dict):
+    def test_unknown_method_returns_error(self, error_probes: tuple):
         """Test unknown method returns proper error."""
-        request = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "unknown/method",
-            "params": {}
-        }
-
-        response = run_mcp_request(request, env=mcp_env)
+        _, _, responses = error_probes
+        response = responses["unknown_method"]
 
         if response:
             # Should return error for unknown method
@@ -4,49 +4,44 @@ E2E Tests: Basic Identity Switching
 Tests basic identity switching functionality without GPG signing.
 """
 
-import subprocess
 from pathlib import Path
 
 import pytest
 
-from conftest import run_juggler, REMOTE_JUGGLER_BIN
+from conftest import JugglerResult, contains_ci, git_cfg, run_git, run_juggler
+
+
+pytestmark = pytest.mark.binary
 
 
 class TestIdentitySwitchBasic:
     """Tests for basic identity switching without GPG."""
 
-    def test_binary_exists(self):
-        """Verify RemoteJuggler binary exists."""
-        assert Path(REMOTE_JUGGLER_BIN).exists() or True, \
-            f"RemoteJuggler binary not found at {REMOTE_JUGGLER_BIN}"
-
-    def test_help_command(self, juggler_env: dict):
+    def test_help_command(self, juggler_help: JugglerResult):
         """Test --help flag works."""
-        result = run_juggler(["--help"], env=juggler_env)
+        result = juggler_help
         # Should exit successfully or with help code
-        assert result.returncode in [0, 1], f"Help failed: {result.stderr}"
+        assert result.returncode in [0, 1], f"Help failed: {result.stdout}"
         # Should contain usage information
         assert "remote-juggler" in result.stdout.lower() or \
                "usage" in result.stdout.lower() or \
                "help" in result.stdout.lower(), \
                f"Help output missing expected content: {result.stdout}"
 
-    def test_version_command(self, juggler_env: dict):
+    def test_version_command(self, juggler_version: JugglerResult):
         """Test --version flag works."""
-        result = run_juggler(["--version"], env=juggler_env)
+        result = juggler_version
         # Version output should contain version number
-        output = result.stdout + result.stderr
-        assert "2." in output or "version" in output.lower(), \
-            f"Version output: {output}"
+        assert contains_ci(result, b"2.", b"version"), \
+            f"Version output: {result.stdout}"
 
     def test_list_identities(self, juggler_env: dict):
         """Test listing configured identities."""
         result = run_juggler(["list"], env=juggler_env)
         # Should show identity information
-        output = result.stdout + result.stderr
         # May show "no config" message if config not found
-        assert result.returncode == 0 or "config" in output.lower(), \
-            f"List failed: {output}"
+        assert result.returncode == 0 or contains_ci(result, b"config"), \
+            f"List failed: {result.stdout}{result.stderr}"
 
     def test_switch_identity_sets_git_user(
         self,
@@ -62,18 +57,8 @@ class TestIdentitySwitchBasic:
         )
 
         # Check git config was updated
-        name_result = subprocess.run(
-            ["git", "config", "user.name"],
-            cwd=temp_git_repo,
-            capture_output=True,
-            text=True
-        )
-        email_result = subprocess.run(
-            ["git", "config", "user.email"],
-            cwd=temp_git_repo,
-            capture_output=True,
-            text=True
-        )
+        name = git_cfg(temp_git_repo, "user", "name")
+        email = git_cfg(temp_git_repo, "user", "email")
 
         # Either the switch worked and set the values, or it used defaults
         # The important thing is that it ran without crashing
@@ -101,7 +86,8 @@ class TestIdentitySwitchBasic:
         )
 
         # Both should complete without fatal errors
-        assert "fatal" not in (result1.stderr + result2.stderr).lower(), \
+        assert b"fatal" not in result1.stderr_bytes.lower() and \
+               b"fatal" not in result2.stderr_bytes.lower(), \
             f"Fatal error during switch"
 
     def test_detect_identity(
@@ -117,10 +103,9 @@ class TestIdentitySwitchBasic:
         )
 
         # Should show detection results or indicate it couldn't detect
-        output = result.stdout + result.stderr
-        assert result.returncode == 0 or "detect" in output.lower() or \
-               "identity" in output.lower() or "remote" in output.lower(), \
-               f"Detect output: {output}"
+        assert result.returncode == 0 or \
+               contains_ci(result, b"detect", b"identity", b"remote"), \
+               f"Detect output: {result.stdout}{result.stderr}"
 
     def test_status_command(
         self,
@@ -135,8 +120,8 @@ class TestIdentitySwitchBasic:
         )
 
         # Status should show some information
-        output = result.stdout + result.stderr
-        assert len(output) > 0, "Status produced no output"
+        assert result.stdout_bytes or result.stderr_bytes, \
+            "Status produced no output"
 
     def test_switch_unknown_identity_fails(
         self,
@@ -151,10 +136,9 @@ class TestIdentitySwitchBasic:
         )
 
         # Should fail or show error message
-        output = result.stdout + result.stderr
-        assert result.returncode != 0 or "not found" in output.lower() or \
-               "unknown" in output.lower() or "error" in output.lower(), \
-               f"Should fail for unknown identity: {output}"
+        assert result.returncode != 0 or \
+               contains_ci(result, b"not found", b"unknown", b"error"), \
+               f"Should fail for unknown identity: {result.stdout}{result.stderr}"
 
     def test_switch_outside_git_repo(
         self,
@@ -170,9 +154,9 @@ class TestIdentitySwitchBasic:
             )
 
             # Should handle gracefully (may succeed partially or show warning)
-            output = result.stdout + result.stderr
-            assert "fatal" not in output.lower() or "not a git" in output.lower(), \
-                f"Unexpected fatal error: {output}"
+            assert not contains_ci(result, b"fatal") or \
+                   contains_ci(result, b"not a git"), \
+                f"Unexpected fatal error: {result.stdout}{result.stderr}"
 
 
 class TestRemoteURLHandling:
@@ -185,12 +169,7 @@ class TestRemoteURLHandling:
     ):
         """Test that switching identity can update remote URL."""
         # Get initial remote
-        initial = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            cwd=temp_git_repo,
-            capture_output=True,
-            text=True
-        )
+        initial = git_cfg(temp_git_repo, 'remote "origin"', "url")
 
         # Switch to work identity
         run_juggler(
@@ -200,16 +179,11 @@ class TestRemoteURLHandling:
         )
 
         # Get new remote
-        after = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            cwd=temp_git_repo,
-            capture_output=True,
-            text=True
-        )
+        after = git_cfg(temp_git_repo, 'remote "origin"', "url")
 
         # Remote URL may or may not change depending on implementation
         # The important thing is it didn't break
-        assert after.returncode == 0, "Remote URL became invalid"
+        assert after, "Remote URL became invalid"
 
     def test_preserve_repo_path_in_remote(
         self,
@@ -218,8 +192,8 @@ class TestRemoteURLHandling:
     ):
         """Test that repo path is preserved when updating remote."""
         # Set a specific remote with repo path
-        subprocess.run(
-            ["git", "remote", "set-url", "origin", "git@gitlab-personal:myorg/myrepo.git"],
+        run_git(
+            ["remote", "set-url", "origin", "git@gitlab-personal:myorg/myrepo.git"],
             cwd=temp_git_repo,
             check=True
         )
@@ -232,13 +206,8 @@ class TestRemoteURLHandling:
         )
 
         # Check repo path is preserved
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            cwd=temp_git_repo,
-            capture_output=True,
-            text=True
-        )
+        url = git_cfg(temp_git_repo, 'remote "origin"', "url") or ""
 
         # The repo path (myorg/myrepo) should still be present
-        assert "myorg/myrepo" in result.stdout or "myrepo" in result.stdout, \
-            f"Repo path not preserved in: {result.stdout}"
+        assert "myorg/myrepo" in url or "myrepo" in url, \
+            f"Repo path not preserved in: {url}"
@@ -4,23 +4,25 @@ E2E Tests: Identity Switching with GPG
 Tests identity switching with GPG signing configuration.
 """
 
-import subprocess
 from pathlib import Path
 
 import pytest
 
-from conftest import run_juggler
+from conftest import contains_ci, git_cfg, run_juggler
+
+
+pytestmark = pytest.mark.binary
 
 
 class TestGPGConfiguration:
     """Tests for GPG signing configuration during identity switch."""
 
-    def test_switch_with_gpg_sets_signing_key(
+    def test_gpg_sequence(
         self,
         temp_git_repo: Path,
         juggler_env: dict
     ):
-        """Test that switching to identity with GPG sets signing key."""
+        """Test work switch sets GPG signing, personal clears it, validate checks it."""
         # Switch to work identity (has GPG configured in fixture)
         result = run_juggler(
             ["switch", "work"],
@@ -28,102 +30,46 @@ class TestGPGConfiguration:
             cwd=temp_git_repo
         )
 
-        # Check if GPG signing key was set
-        signing_key = subprocess.run(
-            ["git", "config", "user.signingkey"],
-            cwd=temp_git_repo,
-            capture_output=True,
-            text=True
-        )
-
         # Either the key was set, or GPG is not configured (both acceptable)
-        output = result.stdout + result.stderr
-        # The test passes if:
+        # The step passes if:
         # 1. A signing key was set, OR
         # 2. GPG was mentioned in output, OR
         # 3. The switch completed without error
-        assert signing_key.returncode == 0 or \
-               "gpg" in output.lower() or \
+        signing_key = git_cfg(temp_git_repo, "user", "signingkey")
+        assert signing_key is not None or \
+               contains_ci(result, b"gpg") or \
                result.returncode == 0, \
-               f"GPG configuration failed: {output}"
+               f"GPG configuration failed: {result.stdout}{result.stderr}"
 
-    def test_switch_with_gpg_enables_commit_signing(
-        self,
-        temp_git_repo: Path,
-        juggler_env: dict
-    ):
-        """Test that GPG commit signing is enabled for identities that want it."""
-        # Switch to work identity
-        run_juggler(
-            ["switch", "work"],
-            env=juggler_env,
-            cwd=temp_git_repo
-        )
+        # commit.gpgsign may or may not be set depending on config and
+        # GPG availability; informational
+        gpg_sign = git_cfg(temp_git_repo, "commit", "gpgsign")
+        if gpg_sign is not None:
+            assert gpg_sign.strip() in ["true", "false", ""], \
+                f"Unexpected gpgsign value: {gpg_sign}"
 
-        # Check commit.gpgsign setting
-        gpg_sign = subprocess.run(
-            ["git", "config", "commit.gpgsign"],
-            cwd=temp_git_repo,
-            capture_output=True,
-            text=True
-        )
-
-        # May or may not be set depending on config and GPG availability
-        # Test is informational
-        if gpg_sign.returncode == 0:
-            assert gpg_sign.stdout.strip() in ["true", "false", ""], \
-                f"Unexpected gpgsign value: {gpg_sign.stdout}"
-
-    def test_switch_without_gpg_clears_signing(
-        self,
-        temp_git_repo: Path,
-        juggler_env: dict
-    ):
-        """Test switching to identity without GPG clears signing config."""
-        # First switch to work (has GPG)
-        run_juggler(
-            ["switch", "work"],
-            env=juggler_env,
-            cwd=temp_git_repo
-        )
-
-        # Then switch to personal (no GPG)
+        # Switch to personal (no GPG): signing should be disabled or cleared
         run_juggler(
             ["switch", "personal"],
             env=juggler_env,
             cwd=temp_git_repo
         )
 
-        # GPG signing should be disabled or key cleared
-        gpg_sign = subprocess.run(
-            ["git", "config", "commit.gpgsign"],
-            cwd=temp_git_repo,
-            capture_output=True,
-            text=True
-        )
-
-        # Either not set or set to false
-        if gpg_sign.returncode == 0:
-            assert gpg_sign.stdout.strip() in ["false", ""], \
-                f"GPG signing should be disabled: {gpg_sign.stdout}"
+        gpg_sign = git_cfg(temp_git_repo, "commit", "gpgsign")
+        if gpg_sign is not None:
+            assert gpg_sign.strip() in ["false", ""], \
+                f"GPG signing should be disabled: {gpg_sign}"
 
-    def test_validate_with_gpg_check(
-        self,
-        temp_git_repo: Path,
-        juggler_env: dict
-    ):
-        """Test validate command with GPG check option."""
+        # Validate with GPG check should mention GPG in some form
         result = run_juggler(
             ["validate", "work", "--checkGPG=true"],
             env=juggler_env,
             cwd=temp_git_repo
         )
 
-        output = result.stdout + result.stderr
-        # Should mention GPG in some form
-        assert "gpg" in output.lower() or "key" in output.lower() or \
-               "validate" in output.lower() or result.returncode == 0, \
-               f"Validate with GPG: {output}"
+        assert contains_ci(result, b"gpg", b"key", b"validate") or \
+               result.returncode == 0, \
+               f"Validate with GPG: {result.stdout}{result.stderr}"
 
 
 class TestGPGAutoDetect:
@@ -144,7 +90,7 @@ class TestGPGAutoDetect:
         )
 
         # Just verify it doesn't crash with GPG operations
-        assert "fatal" not in result.stderr.lower(), \
+        assert b"fatal" not in result.stderr_bytes.lower(), \
             f"Fatal error during GPG operations: {result.stderr}"
 
 
@@ -165,6 +111,6 @@ class TestGPGProviderVerification:
         )
 
         # Should complete without crashing
-        output = result.stdout + result.stderr
-        assert "fatal" not in output.lower() or "panic" not in output.lower(), \
-            f"Validation crashed: {output}"
+        assert not contains_ci(result, b"fatal") or \
+               not contains_ci(result, b"panic"), \
+            f"Validation crashed: {result.stdout}{result.stderr}"